@@ -1,10 +1,15 @@
 import { defineConfig } from 'astro/config';
 import mdx from '@astrojs/mdx';
+import { buildCache } from './src/lib/build-cache';
+import { feeds } from './src/lib/feeds';
 
 export default defineConfig({
-  integrations: [mdx()],
+  // feeds 需要在 buildCache 之后运行，以便读取从缓存复制回来的文章页
+  integrations: [mdx(), buildCache(), feeds({ limit: 20, categoryFeeds: true })],
   site: 'https://yimore7.github.io',
   base: '/blog',
+  // 放在项目内，便于 CI 在两次构建之间恢复（默认位于 node_modules，npm ci 会清空）
+  cacheDir: './.cache/astro',
   build: {
     format: 'directory',
   },
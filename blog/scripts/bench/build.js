@@ -0,0 +1,323 @@
+#!/usr/bin/env node
+
+// 构建性能测试：生成合成语料，分阶段计时并与基线对比
+//
+//   node scripts/bench/build.js --sizes=100,1000
+//
+//   --sizes=N,N        语料规模（文章数），默认 100,1000
+//   --skip-check       跳过 astro check
+//   --keep             保留 .bench/ 下的临时工作目录
+//   --update-baseline  把本次结果写为新的基线
+//   --threshold=0.15   比基线慢/大超过这个比例视为退化
+//
+// 每次结果追加到 scripts/bench/results/history.json，
+// 与 scripts/bench/results/baseline.json 对比，有退化或阶段失败时以非零状态退出。
+
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+import { spawn, execFileSync } from 'child_process';
+import { fileURLToPath, pathToFileURL } from 'url';
+import { generateCorpus } from './generate-corpus.js';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = path.dirname(__filename);
+
+const ROOT_DIR = path.resolve(__dirname, '../..');
+const BENCH_DIR = path.join(ROOT_DIR, '.bench');
+const RESULTS_DIR = path.join(__dirname, 'results');
+const HISTORY_PATH = path.join(RESULTS_DIR, 'history.json');
+const BASELINE_PATH = path.join(RESULTS_DIR, 'baseline.json');
+const ASTRO_BIN = path.join(ROOT_DIR, 'node_modules/astro/astro.js');
+const RSS_HOOK_URL = pathToFileURL(path.join(__dirname, 'rss-hook.js')).href;
+
+// 复制项目到工作目录时跳过的路径（相对 ROOT_DIR）
+const EXCLUDED_PATHS = new Set([
+  'node_modules',
+  'dist',
+  '.astro',
+  '.bench',
+  '.cache',
+  'src/content/blog',
+  'scripts/sync-manifest.json',
+  'scripts/bench/results',
+]);
+
+function parseArgs(argv) {
+  const options = {
+    sizes: [100, 1000],
+    skipCheck: false,
+    keep: false,
+    updateBaseline: false,
+    threshold: 0.15,
+  };
+
+  for (const arg of argv) {
+    const [name, value] = arg.split('=');
+    if (name === '--sizes') options.sizes = value.split(',').map(Number);
+    else if (name === '--skip-check') options.skipCheck = true;
+    else if (name === '--keep') options.keep = true;
+    else if (name === '--update-baseline') options.updateBaseline = true;
+    else if (name === '--threshold') options.threshold = Number(value);
+    else throw new Error(`Unknown argument: ${arg}`);
+  }
+
+  if (options.sizes.some(size => !Number.isInteger(size) || size < 1)) {
+    throw new Error(`Invalid --sizes: ${options.sizes.join(',')}`);
+  }
+  return options;
+}
+
+function readJson(filePath, fallback) {
+  try {
+    return JSON.parse(fs.readFileSync(filePath, 'utf-8'));
+  } catch (error) {
+    if (error.code === 'ENOENT') return fallback;
+    throw error;
+  }
+}
+
+function writeJson(filePath, data) {
+  fs.mkdirSync(path.dirname(filePath), { recursive: true });
+  fs.writeFileSync(filePath, `${JSON.stringify(data, null, 2)}\n`, 'utf-8');
+}
+
+// 复制项目（不含文章），node_modules 用符号链接共享
+function prepareWorkspace(workspaceDir) {
+  const blogDir = path.join(workspaceDir, 'blog');
+
+  const filter = source => !EXCLUDED_PATHS.has(path.relative(ROOT_DIR, source).split(path.sep).join('/'));
+
+  // 工作目录位于项目内，只能逐个复制顶层条目
+  fs.mkdirSync(blogDir, { recursive: true });
+  for (const entry of fs.readdirSync(ROOT_DIR)) {
+    const source = path.join(ROOT_DIR, entry);
+    if (!filter(source)) continue;
+    fs.cpSync(source, path.join(blogDir, entry), { recursive: true, filter });
+  }
+  fs.symlinkSync(path.join(ROOT_DIR, 'node_modules'), path.join(blogDir, 'node_modules'), 'junction');
+
+  return blogDir;
+}
+
+// 在子进程中运行一个阶段，返回耗时、峰值内存和输出
+function runStage(script, args, cwd) {
+  const rssFile = path.join(os.tmpdir(), `bench-rss-${process.pid}-${Date.now()}.txt`);
+  const env = {
+    ...process.env,
+    NODE_OPTIONS: `${process.env.NODE_OPTIONS ?? ''} --import=${RSS_HOOK_URL}`.trim(),
+    BENCH_RSS_FILE: rssFile,
+    ASTRO_TELEMETRY_DISABLED: '1',
+    // 测的是完整渲染，不能让构建缓存跳过文章页
+    BLOG_BUILD_CACHE: '0',
+  };
+
+  return new Promise((resolve) => {
+    const startTime = process.hrtime.bigint();
+    const child = spawn(process.execPath, [script, ...args], { cwd, env });
+    let output = '';
+    child.stdout.on('data', chunk => { output += chunk; });
+    child.stderr.on('data', chunk => { output += chunk; });
+
+    child.on('close', (code) => {
+      const ms = Number(process.hrtime.bigint() - startTime) / 1e6;
+      let maxRssKb = 0;
+      try {
+        maxRssKb = Math.max(0, ...fs.readFileSync(rssFile, 'utf-8').trim().split('\n').map(Number));
+        fs.unlinkSync(rssFile);
+      } catch {
+        // 子进程没能正常退出时没有内存记录
+      }
+
+      resolve({
+        ok: code === 0,
+        ms: Math.round(ms),
+        rssMB: Math.round(maxRssKb / 1024),
+        output,
+      });
+    });
+  });
+}
+
+// 解析 astro build 输出中每个路由的渲染耗时，例如 "├─ /blog/posts/a/index.html (+12ms)"
+function routeTimings(output) {
+  const timings = [];
+  for (const [, route, value, unit] of output.matchAll(/(\/\S+)\s+\(\+(\d+(?:\.\d+)?)(ms|s)\)/g)) {
+    timings.push({ route, ms: unit === 's' ? Number(value) * 1000 : Number(value) });
+  }
+  if (timings.length === 0) return null;
+
+  const sorted = timings.map(timing => timing.ms).sort((a, b) => a - b);
+  const percentile = p => sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))];
+
+  return {
+    count: timings.length,
+    p50: percentile(0.5),
+    p95: percentile(0.95),
+    max: sorted[sorted.length - 1],
+    slowest: timings.sort((a, b) => b.ms - a.ms).slice(0, 5),
+  };
+}
+
+function directorySize(dir) {
+  let files = 0;
+  let bytes = 0;
+  for (const entry of fs.readdirSync(dir, { withFileTypes: true, recursive: true })) {
+    if (!entry.isFile()) continue;
+    files++;
+    bytes += fs.statSync(path.join(entry.parentPath ?? entry.path, entry.name)).size;
+  }
+  return { files, bytes };
+}
+
+async function benchSize(size, options) {
+  const workspaceDir = path.join(BENCH_DIR, String(size));
+  fs.rmSync(workspaceDir, { recursive: true, force: true });
+  fs.mkdirSync(workspaceDir, { recursive: true });
+
+  console.log(`\n📦 ${size} 篇文章`);
+  const corpus = generateCorpus({ out: workspaceDir, posts: size });
+  const blogDir = prepareWorkspace(workspaceDir);
+  // blog 集合读取的目录，format-content.js 也写到这里
+  fs.renameSync(path.join(workspaceDir, 'posts'), path.join(blogDir, 'src/content/blog'));
+
+  const stages = [
+    ['convert', path.join(blogDir, 'scripts/format-content.js'), ['--force']],
+    ['convert-incremental', path.join(blogDir, 'scripts/format-content.js'), []],
+    ...(options.skipCheck ? [] : [['check', ASTRO_BIN, ['check']]]),
+    ['build', ASTRO_BIN, ['build']],
+  ];
+
+  const result = { size, corpus, stages: {} };
+  for (const [name, script, args] of stages) {
+    const { output, ...stage } = await runStage(script, args, blogDir);
+    if (!stage.ok) {
+      stage.error = output.trim().split('\n').slice(-20).join('\n');
+    }
+    if (name === 'build') {
+      stage.routes = routeTimings(output);
+      // 每篇合成文章都应渲染出一个路由，少了说明文章没有进入 blog 集合，构建“成功”也不算数
+      const rendered = stage.routes?.count ?? 0;
+      if (stage.ok && rendered < size) {
+        stage.ok = false;
+        stage.error = `只渲染了 ${rendered} 个路由，少于生成的 ${size} 篇文章`;
+      }
+    }
+    result.stages[name] = stage;
+    console.log(`  ${stage.ok ? '✓' : '✗'} ${name}: ${stage.ms} ms, ${stage.rssMB} MB`);
+  }
+
+  const distDir = path.join(blogDir, 'dist');
+  if (fs.existsSync(distDir)) {
+    result.output = directorySize(distDir);
+    console.log(`  📁 dist: ${result.output.files} 个文件, ${(result.output.bytes / 1024 / 1024).toFixed(1)} MB`);
+  }
+
+  if (!options.keep) {
+    fs.rmSync(workspaceDir, { recursive: true, force: true });
+  }
+  return result;
+}
+
+// 把一次结果展开为可比较的指标
+function metrics(result) {
+  const values = {};
+  for (const [name, stage] of Object.entries(result.stages)) {
+    if (!stage.ok) continue;
+    values[`${name}.ms`] = stage.ms;
+    values[`${name}.rssMB`] = stage.rssMB;
+    if (stage.routes) values[`${name}.routes.p95`] = stage.routes.p95;
+  }
+  if (result.output) values['output.bytes'] = result.output.bytes;
+  return values;
+}
+
+function compare(results, baseline, threshold) {
+  const rows = [];
+  let regressions = 0;
+
+  for (const result of results) {
+    const previous = baseline?.results.find(entry => entry.size === result.size);
+    if (!previous) continue;
+
+    const before = metrics(previous);
+    for (const [metric, value] of Object.entries(metrics(result))) {
+      if (!(metric in before) || before[metric] === 0) continue;
+      const change = value / before[metric] - 1;
+      const regressed = change > threshold;
+      if (regressed) regressions++;
+      rows.push({
+        size: result.size,
+        metric,
+        baseline: before[metric],
+        current: value,
+        change: `${change >= 0 ? '+' : ''}${(change * 100).toFixed(1)}%`,
+        status: regressed ? '❌' : '✓',
+      });
+    }
+  }
+
+  if (rows.length > 0) {
+    console.log('\n📊 与基线对比:');
+    console.table(rows);
+  }
+  return regressions;
+}
+
+function currentCommit() {
+  try {
+    return execFileSync('git', ['rev-parse', '--short', 'HEAD'], { cwd: ROOT_DIR, encoding: 'utf-8' }).trim();
+  } catch {
+    return null;
+  }
+}
+
+async function main() {
+  const options = parseArgs(process.argv.slice(2));
+
+  if (!fs.existsSync(ASTRO_BIN)) {
+    throw new Error('找不到 astro，请先运行 npm install');
+  }
+
+  const results = [];
+  for (const size of options.sizes) {
+    results.push(await benchSize(size, options));
+  }
+
+  const run = {
+    date: new Date().toISOString(),
+    commit: currentCommit(),
+    node: process.version,
+    cpus: os.availableParallelism(),
+    results,
+  };
+
+  const history = readJson(HISTORY_PATH, []);
+  history.push(run);
+  writeJson(HISTORY_PATH, history);
+
+  const regressions = compare(results, readJson(BASELINE_PATH, null), options.threshold);
+
+  if (options.updateBaseline) {
+    writeJson(BASELINE_PATH, run);
+    console.log(`\n📌 基线已更新: ${path.relative(process.cwd(), BASELINE_PATH)}`);
+  }
+
+  const failures = results.flatMap(result =>
+    Object.entries(result.stages).filter(([, stage]) => !stage.ok).map(([name]) => `${result.size}/${name}`)
+  );
+  if (failures.length > 0) {
+    console.error(`\n❌ 失败的阶段: ${failures.join(', ')}`);
+  }
+  if (regressions > 0) {
+    console.error(`\n❌ ${regressions} 项指标超过基线 ${(options.threshold * 100).toFixed(0)}%`);
+  }
+  if (failures.length > 0 || (regressions > 0 && !options.updateBaseline)) {
+    process.exit(1);
+  }
+}
+
+main().catch((error) => {
+  console.error(`❌ ${error.message}`);
+  process.exit(1);
+});
@@ -0,0 +1,72 @@
+#!/usr/bin/env node
+
+// 对比单遍扫描和原来的多次正则替换提取标题/描述的耗时
+//
+//   node scripts/bench/extract-metadata.js
+
+import { scanMarkdown } from '../lib/markdown-scan.js';
+
+// 每个用例至少运行这么久，取平均值
+const MIN_DURATION_MS = 300;
+
+// 原来 extractMetadata 中的实现，仅用于对比
+function regexExtract(content) {
+  const titleMatch = content.match(/^#\s+(.+)$/m);
+  const title = titleMatch ? titleMatch[1].trim() : null;
+
+  const textContent = content
+    .replace(/^---[\s\S]*?---/m, '')
+    .replace(/^#\s+.+$/m, '')
+    .replace(/```[\s\S]*?```/g, '')
+    .replace(/\[.*?\]\(.*?\)/g, '')
+    .replace(/\s+/g, ' ')
+    .trim();
+
+  const description = textContent.slice(0, 100).trim() + (textContent.length > 100 ? '...' : '');
+  return { title, description };
+}
+
+function scanExtract(content) {
+  const scan = scanMarkdown(content, { maxChars: 100 });
+  return { title: scan.title, description: scan.text + (scan.truncated ? '...' : '') };
+}
+
+const paragraph = '产品经理每天都在做取舍，真正难的不是做什么，而是不做什么。'
+  + 'We ship `small` changes and read [the docs](https://example.com/docs) first. ';
+const codeBlock = '```js\nconst answer = 42;\nconsole.log(answer);\n```\n';
+
+const cases = {
+  typical: `---\ntitle: x\n---\n\n# 一篇普通的笔记\n\n${`${paragraph}\n\n${codeBlock}\n`.repeat(20)}`,
+  large: `# 很长的笔记\n\n${`${paragraph}\n\n${codeBlock}\n`.repeat(20000)}`,
+  'unbalanced-fences': `# 未闭合的代码块\n\n${paragraph}\n${'```\n'.repeat(1)}${`${paragraph}\n`.repeat(20000)}`,
+  'late-title': `${`${paragraph}\n`.repeat(20000)}\n# 标题在最后\n`,
+  'open-brackets': `# 很多左括号\n\n${'[note '.repeat(20000)}\n`,
+  'dash-lines': `${'---\nline\n'.repeat(20000)}`,
+  'paren-urls': `# 地址带括号\n\n${'> quote [x](y(z)) after '.repeat(5000)}\n`,
+};
+
+function measure(fn, input) {
+  let iterations = 0;
+  const start = process.hrtime.bigint();
+  let elapsed = 0;
+  do {
+    fn(input);
+    iterations++;
+    elapsed = Number(process.hrtime.bigint() - start) / 1e6;
+  } while (elapsed < MIN_DURATION_MS);
+  return elapsed / iterations;
+}
+
+const rows = Object.entries(cases).map(([name, input]) => {
+  const regexMs = measure(regexExtract, input);
+  const scanMs = measure(scanExtract, input);
+  return {
+    case: name,
+    size: `${(input.length / 1024).toFixed(0)} KB`,
+    'regex (ms)': regexMs.toFixed(3),
+    'scan (ms)': scanMs.toFixed(3),
+    speedup: `${(regexMs / scanMs).toFixed(1)}x`,
+  };
+});
+
+console.table(rows);
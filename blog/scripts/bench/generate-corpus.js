@@ -0,0 +1,156 @@
+#!/usr/bin/env node
+
+// 生成性能测试用的合成语料
+//
+//   node scripts/bench/generate-corpus.js --posts=1000 --out=/tmp/corpus
+//
+// 会在 out 下生成：
+//   Writing/<分类>/*.md          供 format-content.js 转换的笔记
+//   posts/*.md, posts/*.mdx      可直接放入 src/content/blog 的文章
+// 内容以中文为主，夹杂英文、链接和代码块，相同 seed 生成的内容完全一致。
+
+import fs from 'fs';
+import path from 'path';
+import { pathToFileURL } from 'url';
+
+const WRITING_CATEGORIES = ['工作项目', 'AI相关', '关系成长', '周月刊'];
+const POST_CATEGORIES = ['product', 'ai', 'life'];
+
+const CJK_SENTENCES = [
+  '产品经理每天都在做取舍，真正难的不是做什么，而是不做什么。',
+  '我们先把最小可用的版本交给用户，再根据反馈一点点迭代。',
+  '大模型让很多原本需要几周的原型工作，缩短到了一个下午。',
+  '写作是整理思考的过程，很多想法只有落到纸面上才会变得清晰。',
+  '周末去山里走了一圈，手机没有信号，反而睡得特别踏实。',
+  '需求评审会上最常见的问题，是大家对同一个词有不同的理解。',
+  '数据只能告诉你发生了什么，却很少告诉你为什么会发生。',
+  '保持记录，意义自然浮现。',
+];
+
+const EN_WORDS = [
+  'agent', 'prompt', 'latency', 'roadmap', 'metric', 'pipeline', 'context',
+  'feedback', 'release', 'workflow', 'token', 'baseline', 'prototype',
+];
+
+const CODE_BLOCKS = [
+  '```js\nconst result = await client.search(query);\nconsole.log(result.length);\n```',
+  '```python\nfor item in items:\n    print(item.title)\n```',
+  '```bash\nnpm run build\n```',
+];
+
+// mulberry32，保证相同 seed 的输出可复现
+function createRandom(seed) {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+function pick(random, items) {
+  return items[Math.floor(random() * items.length)];
+}
+
+function paragraph(random) {
+  const parts = [];
+  const sentences = 2 + Math.floor(random() * 5);
+  for (let i = 0; i < sentences; i++) {
+    parts.push(pick(random, CJK_SENTENCES));
+    if (random() < 0.3) parts.push(` ${pick(random, EN_WORDS)} `);
+    if (random() < 0.1) parts.push(`[${pick(random, EN_WORDS)}](https://example.com/${i})`);
+    if (random() < 0.1) parts.push(`\`${pick(random, EN_WORDS)}\``);
+  }
+  return parts.join('');
+}
+
+function body(random, index) {
+  const blocks = [`# 合成笔记 ${index}`];
+  const paragraphs = 4 + Math.floor(random() * 20);
+  for (let i = 0; i < paragraphs; i++) {
+    if (i > 0 && i % 5 === 0) blocks.push(`## 第 ${i / 5} 部分`);
+    blocks.push(paragraph(random));
+    if (random() < 0.2) blocks.push(pick(random, CODE_BLOCKS));
+  }
+  return `${blocks.join('\n\n')}\n`;
+}
+
+function publishDate(random) {
+  // 分布在最近五年内
+  const now = Date.UTC(2026, 0, 1);
+  return new Date(now - Math.floor(random() * 5 * 365) * 86400000);
+}
+
+/**
+ * 生成合成语料，返回生成的文件数。
+ *   posts     总文章数
+ *   mdxRatio  直接生成为 MDX 文章的比例，其余生成为 Writing 笔记
+ */
+export function generateCorpus({ out, posts, mdxRatio = 0.3, seed = 42 }) {
+  const random = createRandom(seed);
+  const writingDir = path.join(out, 'Writing');
+  const postsDir = path.join(out, 'posts');
+
+  for (const category of WRITING_CATEGORIES) {
+    fs.mkdirSync(path.join(writingDir, category), { recursive: true });
+  }
+  fs.mkdirSync(postsDir, { recursive: true });
+
+  const counts = { notes: 0, mdx: 0 };
+
+  for (let i = 0; i < posts; i++) {
+    const content = body(random, i);
+
+    if (random() < mdxRatio) {
+      const date = publishDate(random).toISOString().slice(0, 10);
+      fs.writeFileSync(path.join(postsDir, `synthetic-${i}.mdx`), `---
+title: '合成文章 ${i}'
+description: '${pick(random, CJK_SENTENCES)}'
+publishDate: ${date}
+category: ${pick(random, POST_CATEGORIES)}
+draft: false
+---
+
+${content}
+<div class="note">MDX 内容 {${i} * 2}</div>
+`, 'utf-8');
+      counts.mdx++;
+    } else {
+      const category = pick(random, WRITING_CATEGORIES);
+      const filePath = path.join(writingDir, category, `note ${i}.md`);
+      fs.writeFileSync(filePath, content, 'utf-8');
+      // 笔记的修改时间即发布日期
+      const date = publishDate(random);
+      fs.utimesSync(filePath, date, date);
+      counts.notes++;
+    }
+  }
+
+  return counts;
+}
+
+function parseArgs(argv) {
+  const options = { out: null, posts: 100, mdxRatio: 0.3, seed: 42 };
+
+  for (const arg of argv) {
+    const [name, value] = arg.split('=');
+    if (name === '--out') options.out = path.resolve(value);
+    else if (name === '--posts') options.posts = Number(value);
+    else if (name === '--mdx-ratio') options.mdxRatio = Number(value);
+    else if (name === '--seed') options.seed = Number(value);
+    else throw new Error(`Unknown argument: ${arg}`);
+  }
+
+  if (!options.out) {
+    throw new Error('Missing --out=<dir>');
+  }
+  return options;
+}
+
+if (import.meta.url === pathToFileURL(process.argv[1]).href) {
+  const options = parseArgs(process.argv.slice(2));
+  const counts = generateCorpus(options);
+  console.log(`✅ 已生成 ${counts.notes} 篇笔记和 ${counts.mdx} 篇 MDX 文章 → ${options.out}`);
+}
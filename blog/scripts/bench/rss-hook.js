@@ -0,0 +1,10 @@
+// 通过 NODE_OPTIONS=--import 注入被测进程，退出时记录峰值内存（KB）
+import fs from 'fs';
+
+const output = process.env.BENCH_RSS_FILE;
+
+if (output) {
+  process.on('exit', () => {
+    fs.appendFileSync(output, `${process.resourceUsage().maxRSS}\n`);
+  });
+}
@@ -0,0 +1,187 @@
+#!/usr/bin/env node
+
+// 根据文章和页面中实际用到的字符生成自托管的 WOFF2 子集字体
+//
+//   node scripts/build-fonts.js
+//   node scripts/build-fonts.js --if-present   没有 fonts/ 目录时直接跳过（npm run build 的 prebuild）
+//
+// 需要把 FONTS 中列出的源字体文件放到 fonts/ 目录下，并用 npm run fonts:deps 安装固定版本的 subset-font
+// （它不在 package.json 中，npm ci 不依赖它）。GitHub Actions 在构建前下载源字体并安装。
+// 生成的字体写入 public/fonts/，字体清单写入 src/fonts/manifest.json（都是构建产物，不提交），
+// BaseLayout 据此输出 @font-face 和 preload。
+
+import fs from 'fs';
+import path from 'path';
+import crypto from 'crypto';
+import { fileURLToPath } from 'url';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = path.dirname(__filename);
+
+const ROOT_DIR = path.resolve(__dirname, '..');
+const SOURCE_FONT_DIR = path.join(ROOT_DIR, 'fonts');
+const OUTPUT_DIR = path.join(ROOT_DIR, 'public/fonts');
+const MANIFEST_PATH = path.join(ROOT_DIR, 'src/fonts/manifest.json');
+const PUBLIC_PATH = '/blog/fonts/';
+
+// 统计字符时扫描的目录和扩展名
+const TEXT_SOURCES = [
+  { dir: 'src/content/blog', extensions: ['.md', '.mdx'] },
+  { dir: 'src/pages', extensions: ['.astro'] },
+  { dir: 'src/layouts', extensions: ['.astro'] },
+];
+
+// 要生成的字体
+//   source    fonts/ 下的源字体文件
+//   ranges    只保留这些码点范围内的字符
+//   preload   是否输出 preload；只有首屏一定会用到的字体才值得预加载
+const FONTS = [
+  {
+    family: 'Nunito',
+    source: 'Nunito[wght].ttf',
+    weight: '400 800',
+    style: 'normal',
+    ranges: [[0x20, 0x7e], [0xa0, 0x24f], [0x2000, 0x206f], [0x20ac, 0x20ac]],
+    // 字体栈中 Nunito 排在系统字体之后，多数设备用不到，不预加载
+    preload: false,
+  },
+  {
+    family: 'Noto Sans SC',
+    source: 'NotoSansSC[wght].ttf',
+    weight: '400 800',
+    style: 'normal',
+    ranges: [[0x3000, 0x303f], [0x4e00, 0x9fff], [0xff00, 0xffef]],
+    // 排在字体栈最前，所有设备的中文正文都用它显示，首屏一定会用到
+    preload: true,
+  },
+];
+
+// 始终保留 ASCII，保证页面中动态出现的英文和数字能正常显示
+const ALWAYS_INCLUDED = [[0x20, 0x7e]];
+
+function listFiles(dir, extensions) {
+  if (!fs.existsSync(dir)) return [];
+  return fs.readdirSync(dir, { withFileTypes: true, recursive: true })
+    .filter(entry => entry.isFile() && extensions.includes(path.extname(entry.name)))
+    .map(entry => path.join(entry.parentPath ?? entry.path, entry.name));
+}
+
+// 收集所有用到的码点
+function collectCodePoints() {
+  const codePoints = new Set();
+
+  for (const [start, end] of ALWAYS_INCLUDED) {
+    for (let code = start; code <= end; code++) codePoints.add(code);
+  }
+
+  for (const { dir, extensions } of TEXT_SOURCES) {
+    for (const file of listFiles(path.join(ROOT_DIR, dir), extensions)) {
+      for (const char of fs.readFileSync(file, 'utf-8')) {
+        codePoints.add(char.codePointAt(0));
+      }
+    }
+  }
+
+  return codePoints;
+}
+
+// 把有序码点合并为 CSS unicode-range，例如 U+20-7E,U+4E00
+function toUnicodeRange(codePoints) {
+  const ranges = [];
+  let start = null;
+  let prev = null;
+
+  const flush = () => {
+    if (start === null) return;
+    const hex = code => code.toString(16).toUpperCase();
+    ranges.push(start === prev ? `U+${hex(start)}` : `U+${hex(start)}-${hex(prev)}`);
+  };
+
+  for (const code of codePoints) {
+    if (prev !== null && code === prev + 1) {
+      prev = code;
+      continue;
+    }
+    flush();
+    start = prev = code;
+  }
+  flush();
+
+  return ranges.join(',');
+}
+
+async function loadSubsetFont() {
+  try {
+    return (await import('subset-font')).default;
+  } catch {
+    throw new Error('缺少 subset-font，请先运行 npm run fonts:deps');
+  }
+}
+
+function parseArgs(argv) {
+  const options = { ifPresent: false };
+
+  for (const arg of argv) {
+    if (arg === '--if-present') options.ifPresent = true;
+    else throw new Error(`Unknown argument: ${arg}`);
+  }
+  return options;
+}
+
+async function main() {
+  const options = parseArgs(process.argv.slice(2));
+  if (options.ifPresent && !fs.existsSync(SOURCE_FONT_DIR)) {
+    console.log('⏭️  没有 fonts/ 目录，跳过字体子集');
+    return;
+  }
+
+  const subsetFont = await loadSubsetFont();
+  const used = collectCodePoints();
+  const manifest = [];
+
+  fs.mkdirSync(OUTPUT_DIR, { recursive: true });
+  fs.mkdirSync(path.dirname(MANIFEST_PATH), { recursive: true });
+
+  // 清理旧的子集文件，文件名带哈希，旧文件不会再被引用
+  for (const file of fs.readdirSync(OUTPUT_DIR)) {
+    if (file.endsWith('.woff2')) fs.unlinkSync(path.join(OUTPUT_DIR, file));
+  }
+
+  for (const font of FONTS) {
+    const sourcePath = path.join(SOURCE_FONT_DIR, font.source);
+    if (!fs.existsSync(sourcePath)) {
+      throw new Error(`找不到源字体 ${path.relative(process.cwd(), sourcePath)}`);
+    }
+
+    const codePoints = [...used]
+      .filter(code => font.ranges.some(([start, end]) => code >= start && code <= end))
+      .sort((a, b) => a - b);
+    if (codePoints.length === 0) continue;
+
+    const text = String.fromCodePoint(...codePoints);
+    const woff2 = await subsetFont(fs.readFileSync(sourcePath), text, { targetFormat: 'woff2' });
+
+    const hash = crypto.createHash('sha1').update(woff2).digest('hex').slice(0, 8);
+    const fileName = `${font.family.toLowerCase().replace(/\s+/g, '-')}-${hash}.woff2`;
+    fs.writeFileSync(path.join(OUTPUT_DIR, fileName), woff2);
+
+    manifest.push({
+      family: font.family,
+      file: `${PUBLIC_PATH}${fileName}`,
+      weight: font.weight,
+      style: font.style,
+      unicodeRange: toUnicodeRange(codePoints),
+      preload: font.preload,
+    });
+
+    console.log(`  ${font.family}: ${codePoints.length} 个字符 → ${fileName}（${(woff2.length / 1024).toFixed(1)} KB）`);
+  }
+
+  fs.writeFileSync(MANIFEST_PATH, `${JSON.stringify(manifest, null, 2)}\n`, 'utf-8');
+  console.log(`✅ 字体清单已写入 ${path.relative(process.cwd(), MANIFEST_PATH)}`);
+}
+
+main().catch((error) => {
+  console.error(`❌ ${error.message}`);
+  process.exit(1);
+});
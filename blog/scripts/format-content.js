@@ -1,128 +1,118 @@
 #!/usr/bin/env node
 
 import fs from 'fs';
+import os from 'os';
 import path from 'path';
+import crypto from 'crypto';
 import { fileURLToPath } from 'url';
+import { categoryRules, renderPost } from './lib/content.js';
+import { forEachConcurrent, WorkerPool } from './lib/concurrency.js';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
 
 const WRITING_DIR = path.resolve(__dirname, '../../Writing');
 const PUBLIC_DIR = path.resolve(__dirname, '../../Public');
-const CONTENT_DIR = path.resolve(__dirname, '../src/content/posts');
-
-// 分类映射规则
-const categoryRules = {
-  '工作项目': 'product',
-  'AI相关': 'ai',
-  '关系成长': 'life',
-  '周月刊': 'life',
-  '剪藏中转': null, // 不发布
-  'Inbox_Imports': null, // 不发布
-  'Trash': null, // 不发布
-  '妙言': null, // 不发布
-  '周月刊洞察': null, // 不发布
-};
-
-// 读取文件并提取元数据
-function extractMetadata(filePath, categoryName) {
-  const content = fs.readFileSync(filePath, 'utf-8');
-  const fileName = path.basename(filePath, '.md');
-
-  // 尝试从文件名或内容中提取标题
-  let title = fileName;
-
-  // 尝试提取第一个一级标题作为标题
-  const titleMatch = content.match(/^#\s+(.+)$/m);
-  if (titleMatch) {
-    title = titleMatch[1].trim();
-  }
-
-  // 提取前100字作为描述
-  const textContent = content
-    .replace(/^---[\s\S]*?---/m, '') // 移除已有的 frontmatter
-    .replace(/^#\s+.+$/m, '') // 移除标题
-    .replace(/```[\s\S]*?```/g, '') // 移除代码块
-    .replace(/\[.*?\]\(.*?\)/g, '') // 移除链接
-    .replace(/\s+/g, ' ')
-    .trim();
-
-  const description = textContent.slice(0, 100).trim() + (textContent.length > 100 ? '...' : '');
-
-  // 获取文件修改时间作为发布日期
-  const stats = fs.statSync(filePath);
-  const publishDate = stats.mtime;
-
-  return {
-    title,
-    description,
-    publishDate,
-    category: categoryRules[categoryName] || 'product',
+const CONTENT_DIR = path.resolve(__dirname, '../src/content/blog');
+const MANIFEST_PATH = path.resolve(__dirname, 'sync-manifest.json');
+const WORKER_URL = new URL('./lib/format-worker.js', import.meta.url);
+
+// 生成逻辑变化时递增，旧清单中的哈希随之全部失效
+const MANIFEST_VERSION = 4;
+
+// 每个 worker 对应的同时读取文件数，读 IO 比解析慢，需要多预取一些
+const READS_PER_WORKER = 4;
+
+// 攒够这么多待写文件后一起落盘
+const WRITE_BATCH_SIZE = 64;
+
+// 解析命令行参数
+//   --force            忽略清单，全部重新生成
+//   --prune=draft      源文件被删除时，把文章标记为草稿（默认）
+//   --prune=delete     源文件被删除时，直接删除文章
+//   --concurrency=N    解析用的 worker 数，默认为 CPU 核数，1 表示在主线程中处理
+function parseArgs(argv) {
+  const options = {
+    force: false,
+    prune: 'draft',
+    concurrency: os.availableParallelism(),
   };
-}
 
-// 生成 frontmatter
-function generateFrontmatter(metadata) {
-  return `---
-title: '${metadata.title.replace(/'/g, "''")}'
-description: '${metadata.description.replace(/'/g, "''")}'
-publishDate: ${metadata.publishDate.toISOString().split('T')[0]}
-category: ${metadata.category}
-draft: false
----`;
-}
-
-// 格式化并复制文件
-function formatFile(sourcePath, categoryName) {
-  const metadata = extractMetadata(sourcePath, categoryName);
-
-  // 如果分类为null，跳过
-  if (!metadata.category) {
-    return null;
+  for (const arg of argv) {
+    if (arg === '--force') {
+      options.force = true;
+    } else if (arg.startsWith('--prune=')) {
+      const mode = arg.slice('--prune='.length);
+      if (mode !== 'draft' && mode !== 'delete') {
+        throw new Error(`Unknown prune mode: ${mode}`);
+      }
+      options.prune = mode;
+    } else if (arg.startsWith('--concurrency=')) {
+      const concurrency = Number(arg.slice('--concurrency='.length));
+      if (!Number.isInteger(concurrency) || concurrency < 1) {
+        throw new Error(`Invalid concurrency: ${arg}`);
+      }
+      options.concurrency = concurrency;
+    } else {
+      throw new Error(`Unknown argument: ${arg}`);
+    }
   }
 
-  const content = fs.readFileSync(sourcePath, 'utf-8');
-  const fileName = path.basename(sourcePath, '.md');
-  const slug = `${fileName.toLowerCase().replace(/\s+/g, '-')}`;
-
-  // 移除已有的 frontmatter（如果有的话）
-  const cleanContent = content.replace(/^---[\s\S]*?---\n*/m, '');
-
-  // 生成新内容
-  const newContent = `${generateFrontmatter(metadata)}
+  return options;
+}
 
-${cleanContent}
-`;
+// 读取同步清单，格式不符时视为空清单
+async function loadManifest() {
+  try {
+    const manifest = JSON.parse(await fs.promises.readFile(MANIFEST_PATH, 'utf-8'));
+    if (manifest.version === MANIFEST_VERSION && manifest.entries) {
+      return manifest;
+    }
+  } catch (error) {
+    if (error.code !== 'ENOENT') {
+      console.warn(`⚠️  清单无法读取，将全部重新生成: ${error.message}`);
+    }
+  }
+  return { version: MANIFEST_VERSION, entries: {} };
+}
 
-  // 写入目标位置
-  const targetPath = path.join(CONTENT_DIR, `${slug}.md`);
-  fs.writeFileSync(targetPath, newContent, 'utf-8');
+// 先写临时文件再重命名，避免中断时留下半个文件
+let tmpCounter = 0;
+async function writeFileAtomic(filePath, data) {
+  const tmpPath = `${filePath}.${process.pid}.${tmpCounter++}.tmp`;
+  await fs.promises.writeFile(tmpPath, data, 'utf-8');
+  await fs.promises.rename(tmpPath, filePath);
+}
 
-  return {
-    source: sourcePath,
-    target: targetPath,
-    slug,
-    metadata,
-  };
+function saveManifest(manifest) {
+  return writeFileAtomic(MANIFEST_PATH, `${JSON.stringify(manifest, null, 2)}\n`);
 }
 
-// 扫描并格式化所有文件
-function scanAndFormat() {
-  const results = [];
+function hashContent(categoryName, content) {
+  return crypto
+    .createHash('sha1')
+    .update(`${MANIFEST_VERSION}\0${categoryName}\0`)
+    .update(content)
+    .digest('hex');
+}
 
-  // 确保目标目录存在
-  if (!fs.existsSync(CONTENT_DIR)) {
-    fs.mkdirSync(CONTENT_DIR, { recursive: true });
+// 把源文件已删除的文章标记为草稿
+async function markAsDraft(targetPath) {
+  const content = await fs.promises.readFile(targetPath, 'utf-8');
+  const drafted = content.replace(/^draft:\s*false\s*$/m, 'draft: true');
+  if (drafted !== content) {
+    await writeFileAtomic(targetPath, drafted);
   }
+}
 
-  // 扫描Writing目录
-  const categories = fs.readdirSync(WRITING_DIR, { withFileTypes: true });
+// 逐个产出 Writing 目录下需要发布的 md 文件
+async function* walkSources() {
+  const categories = await fs.promises.opendir(WRITING_DIR);
 
-  for (const category of categories) {
+  for await (const category of categories) {
     if (!category.isDirectory()) continue;
 
     const categoryName = category.name;
-    const categoryPath = path.join(WRITING_DIR, categoryName);
 
     // 跳过被排除的目录
     if (categoryRules[categoryName] === null) {
@@ -130,29 +120,156 @@ function scanAndFormat() {
     }
 
     // 读取目录中的所有md文件
-    const files = fs.readdirSync(categoryPath).filter(f => f.endsWith('.md'));
+    const categoryPath = path.join(WRITING_DIR, categoryName);
+    for await (const file of await fs.promises.opendir(categoryPath)) {
+      if (!file.name.endsWith('.md')) continue;
+      yield { filePath: path.join(categoryPath, file.name), categoryName };
+    }
+  }
+}
 
-    for (const file of files) {
-      const filePath = path.join(categoryPath, file);
+// 扫描并同步所有文件，只重写内容有变化的文章
+async function scanAndFormat(options) {
+  const results = [];
+  const summary = {
+    added: 0,
+    changed: 0,
+    removed: 0,
+    unchanged: 0,
+  };
+
+  // 确保目标目录存在
+  await fs.promises.mkdir(CONTENT_DIR, { recursive: true });
+
+  const [previous, existingTargets] = await Promise.all([
+    options.force ? { version: MANIFEST_VERSION, entries: {} } : loadManifest(),
+    fs.promises.readdir(CONTENT_DIR).then(files => new Set(files)),
+  ]);
+  const manifest = { version: MANIFEST_VERSION, entries: {} };
+
+  // 多于一个 worker 时把解析交给线程池，否则直接在主线程中处理
+  const pool = options.concurrency > 1 ? new WorkerPool(WORKER_URL, options.concurrency) : null;
+  const render = pool ? task => pool.run(task) : async task => renderPost(task);
+
+  // 待写文件互不依赖，攒成一批后并发写入
+  let pendingWrites = [];
+  const flushWrites = async () => {
+    const batch = pendingWrites;
+    pendingWrites = [];
+    await Promise.all(batch.map(async ({ key, entry, result }) => {
       try {
-        const result = formatFile(filePath, categoryName);
-        if (result) {
-          results.push(result);
+        await writeFileAtomic(result.target, result.newContent);
+        delete result.newContent;
+        manifest.entries[key] = entry;
+        summary[result.status]++;
+        results.push(result);
+      } catch (error) {
+        console.error(`Error writing ${result.target}:`, error.message);
+        // 写入失败时保留旧记录，下次运行会重试
+        if (previous.entries[key]) {
+          manifest.entries[key] = previous.entries[key];
+        }
+      }
+    }));
+  };
+
+  try {
+    await forEachConcurrent(walkSources(), options.concurrency * READS_PER_WORKER, async ({ filePath, categoryName }) => {
+      const key = path.relative(WRITING_DIR, filePath);
+      const entry = previous.entries[key];
+      try {
+        const content = await fs.promises.readFile(filePath, 'utf-8');
+        const hash = hashContent(categoryName, content);
+
+        if (entry && entry.hash === hash && existingTargets.has(`${entry.slug}.md`)) {
+          manifest.entries[key] = entry;
+          summary.unchanged++;
+          results.push({
+            source: filePath,
+            target: path.join(CONTENT_DIR, `${entry.slug}.md`),
+            slug: entry.slug,
+            metadata: { ...entry.metadata, publishDate: new Date(entry.metadata.publishDate) },
+            status: 'unchanged',
+          });
+          return;
+        }
+
+        // 获取文件修改时间作为发布日期
+        const stats = await fs.promises.stat(filePath);
+        const { slug, metadata, newContent } = await render({
+          content,
+          filePath,
+          categoryName,
+          publishDate: stats.mtime,
+        });
+
+        pendingWrites.push({
+          key,
+          entry: { hash, slug, metadata },
+          result: {
+            source: filePath,
+            target: path.join(CONTENT_DIR, `${slug}.md`),
+            slug,
+            metadata,
+            newContent,
+            status: entry ? 'changed' : 'added',
+          },
+        });
+        if (pendingWrites.length >= WRITE_BATCH_SIZE) {
+          await flushWrites();
         }
       } catch (error) {
         console.error(`Error processing ${filePath}:`, error.message);
+        // 处理失败时保留旧记录，下次运行会重试
+        if (entry) {
+          manifest.entries[key] = entry;
+        }
       }
-    }
+    });
+    await flushWrites();
+  } finally {
+    await pool?.close();
   }
 
-  return results;
+  // 处理源文件已不存在的文章；同名文章可能已被其他源文件接管（例如移动了分类目录）
+  const liveSlugs = new Set(Object.values(manifest.entries).map(entry => entry.slug));
+  await Promise.all(Object.entries(previous.entries).map(async ([key, entry]) => {
+    if (manifest.entries[key] || liveSlugs.has(entry.slug)) return;
+
+    const targetPath = path.join(CONTENT_DIR, `${entry.slug}.md`);
+    try {
+      if (existingTargets.has(`${entry.slug}.md`)) {
+        if (options.prune === 'delete') {
+          await fs.promises.unlink(targetPath);
+        } else {
+          await markAsDraft(targetPath);
+        }
+      }
+      summary.removed++;
+    } catch (error) {
+      console.error(`Error pruning ${targetPath}:`, error.message);
+      manifest.entries[key] = entry;
+    }
+  }));
+
+  await saveManifest(manifest);
+
+  // 并发处理的完成顺序不固定，按目标路径排序保证输出稳定
+  results.sort((a, b) => a.target.localeCompare(b.target));
+
+  return { results, summary };
 }
 
 // 主函数
-function main() {
+async function main() {
+  const options = parseArgs(process.argv.slice(2));
+  const startTime = process.hrtime.bigint();
+
   console.log('🚀 开始格式化内容...\n');
 
-  const results = scanAndFormat();
+  const { results, summary } = await scanAndFormat(options);
+
+  const elapsed = Number(process.hrtime.bigint() - startTime) / 1e6;
 
   console.log(`✅ 完成！共处理 ${results.length} 个文件:\n`);
 
@@ -163,8 +280,10 @@ function main() {
     life: 0,
   };
 
-  results.forEach(({ source, target, metadata }) => {
+  results.forEach(({ target, metadata, status }) => {
     stats[metadata.category]++;
+    // 未变化的文件不逐条输出，避免大仓库刷屏
+    if (status === 'unchanged') return;
     console.log(`  [${metadata.category}] ${metadata.title}`);
     console.log(`    → ${path.relative(process.cwd(), target)}\n`);
   });
@@ -173,6 +292,16 @@ function main() {
   console.log(`  产品思考: ${stats.product} 篇`);
   console.log(`  AI探索: ${stats.ai} 篇`);
   console.log(`  近况生活: ${stats.life} 篇`);
+
+  console.log('\n🔄 同步:');
+  console.log(`  新增: ${summary.added} 篇`);
+  console.log(`  更新: ${summary.changed} 篇`);
+  console.log(`  移除: ${summary.removed} 篇（${options.prune === 'delete' ? '已删除' : '已标记为草稿'}）`);
+  console.log(`  未变化: ${summary.unchanged} 篇`);
+  console.log(`  耗时: ${elapsed.toFixed(1)} ms（${options.concurrency} 个 worker）`);
 }
 
-main();
+main().catch((error) => {
+  console.error(`❌ ${error.message}`);
+  process.exit(1);
+});
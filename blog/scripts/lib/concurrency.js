@@ -0,0 +1,91 @@
+import { Worker } from 'worker_threads';
+
+// 对异步可迭代对象逐项执行 fn，同时最多 limit 个在执行中
+// fn 需要自行处理错误，这里不会吞掉异常
+export async function forEachConcurrent(iterable, limit, fn) {
+  const inFlight = new Set();
+
+  for await (const item of iterable) {
+    const promise = fn(item).finally(() => inFlight.delete(promise));
+    inFlight.add(promise);
+    if (inFlight.size >= limit) {
+      await Promise.race(inFlight);
+    }
+  }
+
+  await Promise.all(inFlight);
+}
+
+// 固定大小的 worker_threads 池，worker 按需创建，每个 worker 同时只处理一个任务
+export class WorkerPool {
+  constructor(workerUrl, size) {
+    this.workerUrl = workerUrl;
+    this.size = Math.max(1, size);
+    this.workers = [];
+    this.idle = [];
+    this.queue = [];
+    this.pending = new Map();
+    this.nextId = 0;
+  }
+
+  run(task) {
+    return new Promise((resolve, reject) => {
+      this.queue.push({ id: this.nextId++, task, resolve, reject });
+      this.dispatch();
+    });
+  }
+
+  dispatch() {
+    while (this.queue.length > 0) {
+      let worker = this.idle.pop();
+      if (!worker) {
+        if (this.workers.length >= this.size) return;
+        worker = this.spawn();
+      }
+
+      const job = this.queue.shift();
+      this.pending.set(worker, job);
+      worker.postMessage({ id: job.id, task: job.task });
+    }
+  }
+
+  spawn() {
+    const worker = new Worker(this.workerUrl);
+
+    worker.on('message', ({ result, error }) => {
+      const job = this.pending.get(worker);
+      this.pending.delete(worker);
+      this.idle.push(worker);
+      if (error) {
+        job.reject(new Error(error));
+      } else {
+        job.resolve(result);
+      }
+      this.dispatch();
+    });
+
+    // worker 崩溃时让当前任务失败，并从池中移除，后续任务会重新创建 worker
+    worker.on('error', (error) => this.discard(worker, error));
+
+    // 没有触发 'error' 就退出的 worker（例如 process.exit）同样要让当前任务失败，否则任务永远不会结束
+    worker.on('exit', (code) => this.discard(worker, new Error(`Worker exited with code ${code}`)));
+
+    this.workers.push(worker);
+    return worker;
+  }
+
+  discard(worker, error) {
+    const job = this.pending.get(worker);
+    this.pending.delete(worker);
+    this.workers = this.workers.filter(w => w !== worker);
+    this.idle = this.idle.filter(w => w !== worker);
+    if (job) job.reject(error);
+    this.dispatch();
+  }
+
+  async close() {
+    await Promise.all(this.workers.map(worker => worker.terminate()));
+    this.workers = [];
+    this.idle = [];
+  }
+}
@@ -0,0 +1,75 @@
+import path from 'path';
+import { scanMarkdown } from './markdown-scan.js';
+
+// 描述的最大字符数
+const DESCRIPTION_LENGTH = 100;
+
+// 分类映射规则
+export const categoryRules = {
+  '工作项目': 'product',
+  'AI相关': 'ai',
+  '关系成长': 'life',
+  '周月刊': 'life',
+  '剪藏中转': null, // 不发布
+  'Inbox_Imports': null, // 不发布
+  'Trash': null, // 不发布
+  '妙言': null, // 不发布
+  '周月刊洞察': null, // 不发布
+};
+
+// 从文件内容中提取元数据，publishDate 由调用方传入（通常是文件修改时间）
+// scan 为 scanMarkdown 的结果，调用方已扫描过时可直接传入
+export function extractMetadata(content, filePath, categoryName, publishDate, scan) {
+  scan ??= scanMarkdown(content, { maxChars: DESCRIPTION_LENGTH });
+  const fileName = path.basename(filePath, '.md');
+
+  // 第一个一级标题作为标题，没有时使用文件名
+  const title = scan.title ?? fileName;
+
+  // 提取前100字作为描述
+  const description = scan.text + (scan.truncated ? '...' : '');
+
+  return {
+    title,
+    description,
+    publishDate,
+    category: categoryRules[categoryName] || 'product',
+  };
+}
+
+// 生成 frontmatter
+export function generateFrontmatter(metadata) {
+  return `---
+title: '${metadata.title.replace(/'/g, "''")}'
+description: '${metadata.description.replace(/'/g, "''")}'
+publishDate: ${metadata.publishDate.toISOString().split('T')[0]}
+category: ${metadata.category}
+draft: false
+---`;
+}
+
+export function slugFor(sourcePath) {
+  const fileName = path.basename(sourcePath, '.md');
+  return `${fileName.toLowerCase().replace(/\s+/g, '-')}`;
+}
+
+// 把源文件内容转换为文章，不做任何 IO，主线程和 worker 共用
+export function renderPost({ content, filePath, categoryName, publishDate }) {
+  const scan = scanMarkdown(content, { maxChars: DESCRIPTION_LENGTH });
+  const metadata = extractMetadata(content, filePath, categoryName, publishDate, scan);
+
+  // 移除已有的 frontmatter（如果有的话）
+  const cleanContent = content.slice(scan.bodyStart);
+
+  // 生成新内容
+  const newContent = `${generateFrontmatter(metadata)}
+
+${cleanContent}
+`;
+
+  return {
+    slug: slugFor(filePath),
+    metadata,
+    newContent,
+  };
+}
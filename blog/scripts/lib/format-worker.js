@@ -0,0 +1,11 @@
+import { parentPort } from 'worker_threads';
+import { renderPost } from './content.js';
+
+// 接收 { id, task }，返回 { id, result } 或 { id, error }
+parentPort.on('message', ({ id, task }) => {
+  try {
+    parentPort.postMessage({ id, result: renderPost(task) });
+  } catch (error) {
+    parentPort.postMessage({ id, error: error.message });
+  }
+});
@@ -0,0 +1,283 @@
+// 单遍扫描 Markdown，提取 frontmatter、第一个一级标题和开头的纯文本
+//
+// 逐行向前扫描，不回溯：
+// - frontmatter 只识别文档开头的 --- ... ---
+// - 代码块（``` 或 ~~~）整体跳过，未闭合的代码块一直延续到文末
+// - 行内代码保留内容，图片整体去掉，链接和引用链接只保留文字
+// - 正文收集够 maxChars 个字符后只继续找标题，找到即停止
+
+const FENCE_RE = /^ {0,3}(`{3,}|~{3,})/;
+const H1_RE = /^ {0,3}#[ \t]+(.+?)[ \t]*$/;
+const HEADING_RE = /^ {0,3}#{1,6}(?:[ \t]+|$)/;
+const CLOSING_HASHES_RE = /[ \t]+#+[ \t]*$/;
+const THEMATIC_BREAK_RE = /^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$/;
+const REFERENCE_DEF_RE = /^ {0,3}\[[^\]]+\]:/;
+const BLOCK_PREFIX_RE = /^[ \t]*(?:>[ \t]?)*(?:[-*+][ \t]+|\d{1,9}[.)][ \t]+)?/;
+const WHITESPACE_RE = /\s/u;
+const CJK_RE = /[\p{Script=Han}\p{Script=Hiragana}\p{Script=Katakana}\p{Script=Hangul}\u3000-\u303f\uff00-\uffef]/u;
+
+const NO_SPACE = 0;
+const SOFT_SPACE = 1; // 换行：中日韩文字之间不补空格
+const HARD_SPACE = 2;
+
+// 收集纯文本，合并空白并按码点计数，避免截断代理对
+class TextCollector {
+  constructor(maxChars) {
+    this.maxChars = maxChars;
+    this.parts = [];
+    this.length = 0;
+    this.last = '';
+    this.space = NO_SPACE;
+    this.full = false;
+  }
+
+  push(text) {
+    for (const char of text) {
+      if (this.full) return;
+
+      if (WHITESPACE_RE.test(char)) {
+        if (this.length > 0) this.space = HARD_SPACE;
+        continue;
+      }
+
+      if (this.space === HARD_SPACE
+        || (this.space === SOFT_SPACE && !(CJK_RE.test(this.last) && CJK_RE.test(char)))) {
+        this.append(' ');
+      }
+      this.space = NO_SPACE;
+      this.append(char);
+    }
+  }
+
+  append(char) {
+    // 多收一个字符，用来判断是否被截断
+    if (this.length === this.maxChars + 1) {
+      this.full = true;
+      return;
+    }
+    this.parts.push(char);
+    this.length++;
+    this.last = char;
+    if (this.length === this.maxChars + 1) {
+      this.full = true;
+    }
+  }
+
+  lineBreak() {
+    if (this.length > 0 && this.space === NO_SPACE) this.space = SOFT_SPACE;
+  }
+}
+
+// 按嵌套层级为每个左括号找到对应的右括号，没有配对的不出现在结果中
+function matchPairs(line, openChar, closeChar) {
+  const pairs = new Map();
+  const open = [];
+  for (let i = 0; i < line.length; i++) {
+    if (line[i] === openChar) {
+      open.push(i);
+    } else if (line[i] === closeChar && open.length > 0) {
+      pairs.set(open.pop(), i);
+    }
+  }
+  return pairs;
+}
+
+// 去掉行内标记，把可见文字交给 collector
+function collectInline(line, collector) {
+  const missingCodeRuns = new Set();
+  // 正在收集文字的链接：文字在 close 处结束，之后跳到 end
+  const links = [];
+  let brackets = null;
+  let parens = null;
+  let start = 0;
+  let i = 0;
+
+  const flush = (end) => {
+    if (end > start) collector.push(line.slice(start, end));
+  };
+
+  while (i < line.length && !collector.full) {
+    const link = links[links.length - 1];
+    if (link && i >= link.close) {
+      flush(link.close);
+      start = i = Math.max(i, link.end);
+      links.pop();
+      continue;
+    }
+
+    const char = line[i];
+
+    if (char === '`') {
+      let runEnd = i;
+      while (line[runEnd] === '`') runEnd++;
+      const run = line.slice(i, runEnd);
+
+      let close = -1;
+      if (!missingCodeRuns.has(run.length)) {
+        let search = runEnd;
+        while ((close = line.indexOf(run, search)) !== -1 && line[close + run.length] === '`') {
+          search = close + run.length;
+          while (line[search] === '`') search++;
+        }
+        if (close === -1) missingCodeRuns.add(run.length);
+      }
+
+      flush(i);
+      if (close === -1) {
+        collector.push(run);
+        start = i = runEnd;
+      } else {
+        collector.push(line.slice(runEnd, close).trim());
+        start = i = close + run.length;
+      }
+      continue;
+    }
+
+    const isImage = char === '!' && line[i + 1] === '[';
+    if (char === '[' || isImage) {
+      const open = isImage ? i + 1 : i;
+      brackets ??= matchPairs(line, '[', ']');
+      const close = brackets.get(open);
+      if (close === undefined) {
+        i++;
+        continue;
+      }
+
+      // [text](url) 或 [text][ref]，找不到结尾或越过外层链接时按没有地址处理
+      let end = close + 1;
+      const next = line[close + 1];
+      // 地址中的括号和引用中的方括号同样按嵌套层级配对，例如 [x](y(z))
+      let target;
+      if (next === '(') {
+        parens ??= matchPairs(line, '(', ')');
+        target = parens.get(close + 1);
+      } else if (next === '[') {
+        target = brackets.get(close + 1);
+      }
+      if (target !== undefined && !(link && target >= link.close)) end = target + 1;
+
+      flush(i);
+      if (isImage) {
+        start = i = end;
+      } else {
+        links.push({ close, end });
+        start = i = open + 1;
+      }
+      continue;
+    }
+
+    i++;
+  }
+
+  flush(i);
+}
+
+// 解析文档开头的 frontmatter，返回内容和正文起始位置
+function scanFrontmatter(content) {
+  const offset = content.charCodeAt(0) === 0xfeff ? 1 : 0;
+  const firstEnd = content.indexOf('\n', offset);
+  if (firstEnd === -1 || content.slice(offset, firstEnd).trimEnd() !== '---') {
+    return { frontmatter: null, bodyStart: 0 };
+  }
+
+  let lineStart = firstEnd + 1;
+  while (lineStart <= content.length) {
+    let lineEnd = content.indexOf('\n', lineStart);
+    if (lineEnd === -1) lineEnd = content.length;
+
+    const line = content.slice(lineStart, lineEnd).trimEnd();
+    if (line === '---' || line === '...') {
+      let bodyStart = lineEnd;
+      while (content[bodyStart] === '\n' || content[bodyStart] === '\r') bodyStart++;
+      return {
+        frontmatter: content.slice(firstEnd + 1, lineStart).replace(/\r?\n$/, ''),
+        bodyStart,
+      };
+    }
+    lineStart = lineEnd + 1;
+  }
+
+  return { frontmatter: null, bodyStart: 0 };
+}
+
+// 扫描 Markdown 文本
+//   title        第一个一级标题（代码块中的不算），没有时为 null
+//   frontmatter  文档开头 frontmatter 的原始内容，没有时为 null
+//   bodyStart    frontmatter 之后正文的起始位置
+//   text         去掉标题、代码、图片和链接地址后的前 maxChars 个字符
+//   truncated    纯文本是否超过了 maxChars
+export function scanMarkdown(content, { maxChars = 100 } = {}) {
+  const { frontmatter, bodyStart } = scanFrontmatter(content);
+  const collector = new TextCollector(maxChars);
+
+  let title = null;
+  let fence = null;
+  let lineStart = bodyStart;
+
+  while (lineStart < content.length && (title === null || !collector.full)) {
+    let lineEnd = content.indexOf('\n', lineStart);
+    if (lineEnd === -1) lineEnd = content.length;
+
+    // 代码块内或正文已收集够时，只关心以 ` ~ # 开头的行，其余行不必切出来
+    if (fence || collector.full) {
+      let first = lineStart;
+      while (content[first] === ' ' && first - lineStart < 3) first++;
+      const char = content[first];
+      if (char !== '`' && char !== '~' && (fence || char !== '#')) {
+        lineStart = lineEnd + 1;
+        continue;
+      }
+    }
+
+    const line = content.slice(lineStart, lineEnd).replace(/\r$/, '');
+    lineStart = lineEnd + 1;
+
+    if (fence) {
+      const match = line.match(FENCE_RE);
+      if (match && match[1][0] === fence[0] && match[1].length >= fence.length
+        && line.slice(line.indexOf(match[1]) + match[1].length).trim() === '') {
+        fence = null;
+      }
+      continue;
+    }
+
+    const fenceMatch = line.match(FENCE_RE);
+    if (fenceMatch) {
+      fence = fenceMatch[1];
+      collector.lineBreak();
+      continue;
+    }
+
+    if (title === null) {
+      const titleMatch = line.match(H1_RE);
+      if (titleMatch) {
+        title = titleMatch[1].replace(CLOSING_HASHES_RE, '');
+        collector.lineBreak();
+        continue;
+      }
+    }
+
+    if (collector.full) continue;
+
+    if (THEMATIC_BREAK_RE.test(line) || REFERENCE_DEF_RE.test(line)) {
+      collector.lineBreak();
+      continue;
+    }
+
+    const heading = line.match(HEADING_RE);
+    const text = heading
+      ? line.slice(heading[0].length).replace(CLOSING_HASHES_RE, '')
+      : line.replace(BLOCK_PREFIX_RE, '');
+
+    collectInline(text, collector);
+    collector.lineBreak();
+  }
+
+  return {
+    title,
+    frontmatter,
+    bodyStart,
+    text: collector.parts.slice(0, maxChars).join('').trim(),
+    truncated: collector.length > maxChars,
+  };
+}
@@ -0,0 +1,9 @@
+// 分类页和归档页每页显示的文章数
+export const POSTS_PER_PAGE = 20;
+
+// 分类的显示名称，搜索页的浏览器脚本也会用到，所以不能放在引入 astro:content 的模块里
+export const categoryLabels = {
+  life: '生活记录',
+  product: '工作思考',
+  ai: 'AI探索',
+};
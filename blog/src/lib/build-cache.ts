@@ -0,0 +1,281 @@
+import fs from 'node:fs';
+import path from 'node:path';
+import crypto from 'node:crypto';
+import { fileURLToPath } from 'node:url';
+import type { AstroIntegration } from 'astro';
+
+// 跨构建复用文章页面的缓存
+//
+// 每篇文章的缓存键 = 集合条目（id、slug、frontmatter、正文）+ 共享输入。
+// 共享输入是 src/ 下除页面路由和文章正文以外的所有文件（布局、组件、文章引用的图片等），
+// 加上 posts/[id].astro、配置和 lockfile，文章可能引用到的文件不必逐个列出。
+//
+// 构建开始时计算共享输入的哈希；posts/[id].astro 用和页面相同的集合条目算出每篇文章的键，
+// 跳过命中缓存的文章；构建结束后把命中的页面及其引用的 _astro 资源复制回 dist，
+// 并把新渲染的页面存入缓存。
+//
+// 缓存目录默认为 .cache/build，可用 BLOG_BUILD_CACHE_DIR 指定，BLOG_BUILD_CACHE=0 关闭。
+
+/** 构建过程中 posts/[id].astro 通过这个环境变量找到缓存目录 */
+const STATE_ENV = 'BLOG_BUILD_CACHE_STATE';
+
+/** 缓存格式变化时递增 */
+const CACHE_VERSION = 1;
+
+/** src/ 以外影响文章页渲染结果的文件（相对项目根目录） */
+const SHARED_FILES = ['astro.config.mjs', 'package-lock.json'];
+
+/** 文章页的路由文件；src/pages 下的其他路由不影响文章页 */
+const POST_ROUTE = 'src/pages/posts/[id].astro';
+
+/** 集合条目的正文，按条目单独计入缓存键 */
+const ENTRY_RE = /^src\/content\/.+\.mdx?$/;
+
+interface BuildState {
+  /** 缓存目录 */
+  cacheDir: string;
+  /** 共享输入的哈希 */
+  shared: string;
+}
+
+interface PostsState {
+  /** 文章 id → 缓存键 */
+  keys: Record<string, string>;
+  /** 命中缓存、本次不需要渲染的文章 id */
+  hits: string[];
+  /** 文章 id → dist 中的页面路径 */
+  routes: Record<string, string>;
+}
+
+/** posts/[id].astro 传入的集合条目，只用到这些字段 */
+export interface CacheablePost {
+  id: string;
+  slug: string;
+  body: string;
+  data: unknown;
+}
+
+interface CachedPage {
+  /** dist 中的页面路径 */
+  route: string;
+  /** 页面引用的 _astro 资源 */
+  assets: string[];
+}
+
+function listFiles(root: string, entry: string): string[] {
+  const fullPath = path.join(root, entry);
+  if (!fs.existsSync(fullPath)) return [];
+  if (!fs.statSync(fullPath).isDirectory()) return [entry];
+  return fs.readdirSync(fullPath)
+    .sort()
+    .flatMap(child => listFiles(root, path.join(entry, child)));
+}
+
+function isSharedInput(file: string): boolean {
+  if (ENTRY_RE.test(file)) return false;
+  return !file.startsWith('src/pages/') || file === POST_ROUTE;
+}
+
+function sharedKey(root: string): string {
+  const files = [
+    ...SHARED_FILES.flatMap(entry => listFiles(root, entry)),
+    ...listFiles(root, 'src').map(file => file.split(path.sep).join('/')).filter(isSharedInput),
+  ];
+
+  const hash = crypto.createHash('sha1');
+  // 页脚的年份随时间变化
+  hash.update(`${CACHE_VERSION}\0${new Date().getFullYear()}\0`);
+  for (const file of files) {
+    hash.update(`${file}\0`);
+    hash.update(fs.readFileSync(path.join(root, file)));
+  }
+  return hash.digest('hex');
+}
+
+function postKey(shared: string, post: CacheablePost): string {
+  return crypto.createHash('sha1')
+    .update(`${shared}\0${post.id}\0${post.slug}\0${JSON.stringify(post.data)}\0`)
+    .update(post.body)
+    .digest('hex');
+}
+
+function readJson<T>(filePath: string): T | undefined {
+  try {
+    return JSON.parse(fs.readFileSync(filePath, 'utf-8'));
+  } catch {
+    return undefined;
+  }
+}
+
+function copyFile(from: string, to: string) {
+  fs.mkdirSync(path.dirname(to), { recursive: true });
+  fs.copyFileSync(from, to);
+}
+
+// 页面中引用的 _astro 资源，例如 href="/blog/_astro/BaseLayout.abc123.css"
+function referencedAssets(html: string): string[] {
+  const assets = new Set<string>();
+  for (const [, asset] of html.matchAll(/(?:href|src)="[^"]*?\/(_astro\/[^"?#]+)"/g)) {
+    assets.add(asset);
+  }
+  return [...assets];
+}
+
+/** 构建缓存目录，BLOG_BUILD_CACHE=0 时为 undefined；订阅源的正文缓存也放在这里 */
+export function buildCacheDir(root: string): string | undefined {
+  if (process.env.BLOG_BUILD_CACHE === '0') return undefined;
+  return path.resolve(root, process.env.BLOG_BUILD_CACHE_DIR ?? '.cache/build');
+}
+
+/** 上一次构建中文章页面（dist 中的路径）对应的缓存键，页面内容由缓存键唯一决定 */
+export function pageKeys(cacheDir: string): Record<string, string> {
+  return readJson<Record<string, string>>(path.join(cacheDir, 'keys.json')) ?? {};
+}
+
+function statePath(): string | undefined {
+  return process.env[STATE_ENV];
+}
+
+function isComplete(cacheDir: string, key: string): boolean {
+  const page = readJson<CachedPage>(path.join(cacheDir, 'pages', `${key}.json`));
+  const filesDir = path.join(cacheDir, 'files');
+  return Boolean(page)
+    && fs.existsSync(path.join(filesDir, 'pages', `${key}.html`))
+    && page!.assets.every(asset => fs.existsSync(path.join(filesDir, asset)));
+}
+
+/**
+ * 计算文章的缓存键，返回本次命中缓存、不需要渲染的文章 id。
+ * routeOf 给出文章在 dist 中的页面路径，构建结束后据此保存新渲染的页面。
+ * 不在构建中（例如开发模式）或缓存关闭时为空。
+ */
+export function cachedPostIds(posts: CacheablePost[], routeOf: (post: CacheablePost) => string): Set<string> {
+  const file = statePath();
+  const state = file ? readJson<BuildState>(file) : undefined;
+  if (!file || !state) return new Set();
+
+  const keys: Record<string, string> = {};
+  const routes: Record<string, string> = {};
+  const hits = new Set<string>();
+  for (const post of posts) {
+    const key = postKey(state.shared, post);
+    keys[post.id] = key;
+    routes[post.id] = routeOf(post);
+    if (isComplete(state.cacheDir, key)) hits.add(post.id);
+  }
+
+  fs.writeFileSync(
+    path.join(path.dirname(file), 'posts.json'),
+    JSON.stringify({ keys, hits: [...hits], routes } satisfies PostsState),
+  );
+  return hits;
+}
+
+export function buildCache(): AstroIntegration {
+  let root = '';
+  let cacheDir = '';
+
+  const pagesDir = () => path.join(cacheDir, 'pages');
+  const filesDir = () => path.join(cacheDir, 'files');
+
+  return {
+    name: 'blog-build-cache',
+    hooks: {
+      'astro:config:done': ({ config }) => {
+        root = fileURLToPath(config.root);
+      },
+
+      'astro:build:start': () => {
+        cacheDir = buildCacheDir(root) ?? '';
+        if (!cacheDir) return;
+
+        fs.mkdirSync(pagesDir(), { recursive: true });
+        fs.rmSync(path.join(cacheDir, 'posts.json'), { force: true });
+        // keys.json 只描述本次构建的页面，写入之前不能被订阅源读到上一次的
+        fs.rmSync(path.join(cacheDir, 'keys.json'), { force: true });
+
+        const file = path.join(cacheDir, 'state.json');
+        fs.writeFileSync(file, JSON.stringify({ cacheDir, shared: sharedKey(root) } satisfies BuildState));
+        process.env[STATE_ENV] = file;
+      },
+
+      'astro:build:done': ({ dir, logger }) => {
+        if (!cacheDir) return;
+
+        const distDir = fileURLToPath(dir);
+        const { keys, hits, routes } = readJson<PostsState>(path.join(cacheDir, 'posts.json'))
+          ?? { keys: {}, hits: [], routes: {} };
+        const hitIds = new Set(hits);
+        const builtKeys: Record<string, string> = {};
+        let saved = 0;
+
+        // 命中的文章必须是文章页声明过、且路径没有变化的路由，否则复制回去的页面对不上
+        for (const id of hitIds) {
+          const page = readJson<CachedPage>(path.join(pagesDir(), `${keys[id]}.json`));
+          if (!routes[id] || page?.route !== routes[id]) {
+            throw new Error(`Cached post "${id}" is not a rendered route (cached ${page?.route}, expected ${routes[id]})`);
+          }
+        }
+
+        for (const [id, key] of Object.entries(keys)) {
+          const pageFile = path.join(pagesDir(), `${key}.json`);
+          const htmlFile = path.join(filesDir(), 'pages', `${key}.html`);
+
+          if (hitIds.has(id)) {
+            // 复用：页面和它引用的资源复制回 dist
+            const page = readJson<CachedPage>(pageFile)!;
+            copyFile(htmlFile, path.join(distDir, page.route));
+            builtKeys[page.route] = key;
+            for (const asset of page.assets) {
+              const target = path.join(distDir, asset);
+              if (!fs.existsSync(target)) copyFile(path.join(filesDir(), asset), target);
+            }
+            continue;
+          }
+
+          // 新渲染：页面和资源存入缓存，资源文件名带内容哈希，已存在的不必重复复制
+          const route = routes[id];
+          const builtFile = path.join(distDir, route);
+          if (!fs.existsSync(builtFile)) continue;
+
+          const assets = referencedAssets(fs.readFileSync(builtFile, 'utf-8'));
+          copyFile(builtFile, htmlFile);
+          for (const asset of assets) {
+            const cached = path.join(filesDir(), asset);
+            if (!fs.existsSync(cached)) copyFile(path.join(distDir, asset), cached);
+          }
+          fs.writeFileSync(pageFile, JSON.stringify({ route, assets } satisfies CachedPage));
+          builtKeys[route] = key;
+          saved++;
+        }
+        fs.writeFileSync(path.join(cacheDir, 'keys.json'), JSON.stringify(builtKeys));
+
+        // 清理不再对应任何文章的缓存，避免缓存目录无限增长
+        const liveKeys = new Set(Object.values(keys));
+        const liveAssets = new Set<string>();
+        for (const file of fs.readdirSync(pagesDir())) {
+          const key = path.basename(file, '.json');
+          if (!liveKeys.has(key)) {
+            fs.rmSync(path.join(pagesDir(), file), { force: true });
+            fs.rmSync(path.join(filesDir(), 'pages', `${key}.html`), { force: true });
+            continue;
+          }
+          for (const asset of readJson<CachedPage>(path.join(pagesDir(), file))?.assets ?? []) {
+            liveAssets.add(asset);
+          }
+        }
+        for (const asset of listFiles(filesDir(), '_astro')) {
+          if (!liveAssets.has(asset.split(path.sep).join('/'))) {
+            fs.rmSync(path.join(filesDir(), asset), { force: true });
+          }
+        }
+
+        fs.rmSync(path.join(cacheDir, 'state.json'), { force: true });
+        fs.rmSync(path.join(cacheDir, 'posts.json'), { force: true });
+        delete process.env[STATE_ENV];
+
+        logger.info(`reused ${hitIds.size} / ${Object.keys(keys).length} cached post pages, cached ${saved} newly rendered`);
+      },
+    },
+  };
+}
@@ -0,0 +1,362 @@
+import fs from 'node:fs';
+import path from 'node:path';
+import crypto from 'node:crypto';
+import { once } from 'node:events';
+import { fileURLToPath } from 'node:url';
+import type { AstroIntegration } from 'astro';
+import { buildCacheDir, pageKeys } from './build-cache';
+
+// 构建结束后根据 dist 中已渲染的页面生成 rss.xml、atom.xml 和 sitemap.xml
+//
+// 文章的元数据来自 BlogPost 输出的 <meta>，正文直接取已渲染页面中的 .article-content，
+// 不会为了订阅源再渲染一遍文章。清理后的正文按文章页的构建缓存键缓存在构建缓存目录的 feeds/ 下，
+// 命中时不再读取整个页面；构建缓存关闭时（BLOG_BUILD_CACHE=0）不缓存。
+// 所有文件都以流的方式写出，不在内存中拼接整份 XML。
+
+export interface FeedOptions {
+  /** 订阅源中的文章数 */
+  limit?: number;
+  /** 是否为每个分类额外生成 rss-<分类>.xml 和 atom-<分类>.xml */
+  categoryFeeds?: boolean;
+  /** 订阅源标题 */
+  title?: string;
+  /** 订阅源描述 */
+  description?: string;
+}
+
+/** 单个 sitemap 文件的 URL 上限，超过时拆分为索引加分片 */
+const SITEMAP_CHUNK_SIZE = 50000;
+
+/** 正文清理规则变化时递增，使缓存失效 */
+const FEED_CACHE_VERSION = 2;
+
+/** 读取页面头部时最多读取的字节数，元数据都在 <head> 中 */
+const HEAD_BYTES = 8192;
+
+interface FeedPost {
+  file: string;
+  url: string;
+  title: string;
+  description: string;
+  category: string;
+  categoryLabel: string;
+  publishDate: Date;
+}
+
+// 以流的方式写文件，遵守背压
+class StreamWriter {
+  private stream: fs.WriteStream;
+
+  constructor(file: string) {
+    fs.mkdirSync(path.dirname(file), { recursive: true });
+    this.stream = fs.createWriteStream(file, 'utf-8');
+  }
+
+  async write(chunk: string) {
+    if (!this.stream.write(chunk)) {
+      await once(this.stream, 'drain');
+    }
+  }
+
+  end(): Promise<void> {
+    return new Promise((resolve, reject) => {
+      this.stream.once('error', reject);
+      this.stream.end(resolve);
+    });
+  }
+}
+
+function escapeXml(text: string): string {
+  return text
+    .replace(/&/g, '&amp;')
+    .replace(/</g, '&lt;')
+    .replace(/>/g, '&gt;')
+    .replace(/"/g, '&quot;');
+}
+
+function unescapeHtml(text: string): string {
+  return text
+    .replace(/&quot;/g, '"')
+    .replace(/&#39;|&#x27;/g, "'")
+    .replace(/&lt;/g, '<')
+    .replace(/&gt;/g, '>')
+    .replace(/&amp;/g, '&');
+}
+
+function readHead(file: string): string {
+  const fd = fs.openSync(file, 'r');
+  try {
+    const buffer = Buffer.alloc(HEAD_BYTES);
+    const bytes = fs.readSync(fd, buffer, 0, HEAD_BYTES, 0);
+    return buffer.toString('utf-8', 0, bytes);
+  } finally {
+    fs.closeSync(fd);
+  }
+}
+
+function metaTags(head: string): Map<string, string> {
+  const tags = new Map<string, string>();
+  for (const [, name, content] of head.matchAll(/<meta (?:property|name)="([^"]+)" content="([^"]*)"/g)) {
+    tags.set(name, unescapeHtml(content));
+  }
+  return tags;
+}
+
+function isNoindex(head: string): boolean {
+  return /<meta name="robots" content="[^"]*noindex/.test(head);
+}
+
+function listHtmlFiles(dir: string): string[] {
+  return fs.readdirSync(dir, { withFileTypes: true, recursive: true })
+    .filter(entry => entry.isFile() && entry.name === 'index.html')
+    .map(entry => path.join(entry.parentPath ?? entry.path, entry.name))
+    .sort();
+}
+
+// 取出 .article-content 的内部 HTML，按 div 嵌套层级找到对应的结束标签
+function articleContent(html: string): string {
+  const start = html.search(/<div class="article-content"[^>]*>/);
+  if (start === -1) return '';
+
+  const openEnd = html.indexOf('>', start) + 1;
+  const tags = /<(\/?)div\b[^>]*>/g;
+  tags.lastIndex = openEnd;
+  let depth = 1;
+  for (let match = tags.exec(html); match; match = tags.exec(html)) {
+    depth += match[1] ? -1 : 1;
+    if (depth === 0) return html.slice(openEnd, match.index);
+  }
+  return html.slice(openEnd);
+}
+
+// 标签中的一个属性，值可以用双引号、单引号或不加引号；整段匹配，属性值里的文字不会被当成属性
+const ATTRIBUTE_RE = /\s([^\s"'>\/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+)))?/g;
+
+// 浏览器解析 URL 时会忽略控制字符和空白，判断协议前先去掉
+const SCRIPT_URL_RE = /^(?:javascript|vbscript):/i;
+
+function absoluteUrl(url: string, pageUrl: string): string {
+  try {
+    return new URL(url, pageUrl).href;
+  } catch {
+    return url;
+  }
+}
+
+// 去掉脚本、样式和内联事件等订阅源阅读器不应执行的内容，相对链接按页面地址改为绝对地址
+function sanitize(html: string, pageUrl: string): string {
+  return html
+    .replace(/<(script|style|iframe|object|embed|form|template)\b[\s\S]*?<\/\1>/gi, '')
+    .replace(/<(?:script|iframe|embed|link|meta)\b[^>]*>/gi, '')
+    // 只处理标签内的属性，避免误改正文
+    .replace(/<[a-z][^>]*>/gi, tag => tag.replace(ATTRIBUTE_RE, (attribute, name: string, double?: string, single?: string, bare?: string) => {
+      const key = name.toLowerCase();
+      if (/^on\w+$/.test(key) || key.startsWith('data-astro-') || key === 'style') return '';
+      if (key !== 'href' && key !== 'src' && key !== 'srcset') return attribute;
+
+      const value = double ?? single ?? bare ?? '';
+      if (key !== 'srcset' && SCRIPT_URL_RE.test(unescapeHtml(value).replace(/[\u0000-\u0020]/g, ''))) {
+        return '';
+      }
+      // srcset 为逗号分隔的 "地址 描述符"
+      const rewritten = key === 'srcset'
+        ? value.split(',').map(candidate => candidate.trim().replace(/^\S+/, url => absoluteUrl(url, pageUrl))).join(', ')
+        : absoluteUrl(value, pageUrl);
+      return ` ${name}="${rewritten.replace(/"/g, '&quot;')}"`;
+    }))
+    .trim();
+}
+
+export function feeds(options: FeedOptions = {}): AstroIntegration {
+  const {
+    limit = 20,
+    categoryFeeds = true,
+    title = "Yim's Blog",
+    description = '产品经理的思考与实践',
+  } = options;
+
+  let root = '';
+  let site = '';
+  let base = '';
+
+  return {
+    name: 'blog-feeds',
+    hooks: {
+      'astro:config:done': ({ config }) => {
+        root = fileURLToPath(config.root);
+        site = config.site ?? 'http://localhost';
+        base = config.base.replace(/\/$/, '');
+      },
+
+      'astro:build:done': async ({ dir, logger }) => {
+        const distDir = fileURLToPath(dir);
+        const buildCache = buildCacheDir(root);
+        const cacheDir = buildCache && path.join(buildCache, 'feeds');
+        const keys = buildCache ? pageKeys(buildCache) : {};
+        if (cacheDir) fs.mkdirSync(cacheDir, { recursive: true });
+
+        const pageUrl = (file: string) => {
+          const route = path.relative(distDir, path.dirname(file)).split(path.sep).join('/');
+          return new URL(`${base}/${route ? `${route}/` : ''}`, site).href;
+        };
+
+        // 收集页面：文章页带有 article:published_time，草稿带有 noindex
+        const pages: { url: string; lastmod?: string }[] = [];
+        const posts: FeedPost[] = [];
+        for (const file of listHtmlFiles(distDir)) {
+          const head = readHead(file);
+          if (isNoindex(head)) continue;
+
+          const url = pageUrl(file);
+          const tags = metaTags(head);
+          const published = tags.get('article:published_time');
+          pages.push({ url, lastmod: published?.slice(0, 10) });
+
+          if (published) {
+            posts.push({
+              file,
+              url,
+              title: tags.get('og:title') ?? '',
+              description: tags.get('description') ?? '',
+              category: tags.get('category') ?? '',
+              categoryLabel: tags.get('article:section') ?? '',
+              publishDate: new Date(published),
+            });
+          }
+        }
+        posts.sort((a, b) => b.publishDate.valueOf() - a.publishDate.valueOf());
+
+        // 清理后的正文按文章页的构建缓存键缓存，命中时不读取页面
+        const usedCacheFiles = new Set<string>();
+        const contentOf = (post: FeedPost): string => {
+          const render = () => sanitize(articleContent(fs.readFileSync(post.file, 'utf-8')), post.url);
+          const pageKey = keys[path.relative(distDir, post.file).split(path.sep).join('/')];
+          if (!cacheDir || !pageKey) return render();
+
+          const key = crypto.createHash('sha1')
+            .update(`${FEED_CACHE_VERSION}\0${site}\0${pageKey}`)
+            .digest('hex');
+          const cacheFile = path.join(cacheDir, `${key}.html`);
+          usedCacheFiles.add(`${key}.html`);
+
+          if (fs.existsSync(cacheFile)) {
+            return fs.readFileSync(cacheFile, 'utf-8');
+          }
+          const content = render();
+          fs.writeFileSync(cacheFile, content);
+          return content;
+        };
+
+        const feedSets = [{ suffix: '', title, entries: posts.slice(0, limit) }];
+        if (categoryFeeds) {
+          const byCategory = new Map<string, FeedPost[]>();
+          for (const post of posts) {
+            if (!post.category) continue;
+            const entries = byCategory.get(post.category) ?? [];
+            if (entries.length < limit) entries.push(post);
+            byCategory.set(post.category, entries);
+          }
+          for (const [category, entries] of byCategory) {
+            feedSets.push({ suffix: `-${category}`, title: `${title} - ${entries[0].categoryLabel}`, entries });
+          }
+        }
+
+        const homeUrl = new URL(`${base}/`, site).href;
+        for (const feed of feedSets) {
+          const rssUrl = new URL(`${base}/rss${feed.suffix}.xml`, site).href;
+          const atomUrl = new URL(`${base}/atom${feed.suffix}.xml`, site).href;
+          const updated = (feed.entries[0]?.publishDate ?? new Date()).toISOString();
+
+          const rss = new StreamWriter(path.join(distDir, `rss${feed.suffix}.xml`));
+          const atom = new StreamWriter(path.join(distDir, `atom${feed.suffix}.xml`));
+
+          await rss.write(`<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+<channel>
+<title>${escapeXml(feed.title)}</title>
+<link>${homeUrl}</link>
+<description>${escapeXml(description)}</description>
+<language>zh-CN</language>
+<atom:link href="${rssUrl}" rel="self" type="application/rss+xml"/>
+`);
+          await atom.write(`<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xml:lang="zh-CN">
+<title>${escapeXml(feed.title)}</title>
+<subtitle>${escapeXml(description)}</subtitle>
+<id>${homeUrl}</id>
+<link href="${homeUrl}"/>
+<link href="${atomUrl}" rel="self"/>
+<updated>${updated}</updated>
+`);
+
+          for (const post of feed.entries) {
+            const content = escapeXml(contentOf(post));
+            await rss.write(`<item>
+<title>${escapeXml(post.title)}</title>
+<link>${post.url}</link>
+<guid isPermaLink="true">${post.url}</guid>
+<pubDate>${post.publishDate.toUTCString()}</pubDate>
+<category>${escapeXml(post.categoryLabel)}</category>
+<description>${escapeXml(post.description)}</description>
+<content:encoded>${content}</content:encoded>
+</item>
+`);
+            await atom.write(`<entry>
+<title>${escapeXml(post.title)}</title>
+<link href="${post.url}"/>
+<id>${post.url}</id>
+<published>${post.publishDate.toISOString()}</published>
+<updated>${post.publishDate.toISOString()}</updated>
+<category term="${escapeXml(post.category)}" label="${escapeXml(post.categoryLabel)}"/>
+<summary>${escapeXml(post.description)}</summary>
+<content type="html">${content}</content>
+</entry>
+`);
+          }
+
+          await rss.write('</channel>\n</rss>\n');
+          await atom.write('</feed>\n');
+          await Promise.all([rss.end(), atom.end()]);
+        }
+
+        // 删除不再使用的正文缓存
+        if (cacheDir) {
+          for (const file of fs.readdirSync(cacheDir)) {
+            if (!usedCacheFiles.has(file)) fs.rmSync(path.join(cacheDir, file), { force: true });
+          }
+        }
+
+        // sitemap：不超过上限时直接写 sitemap.xml，否则 sitemap.xml 作为索引指向各分片
+        const writeUrlSet = async (file: string, urls: typeof pages) => {
+          const sitemap = new StreamWriter(file);
+          await sitemap.write('<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n');
+          for (const page of urls) {
+            await sitemap.write(page.lastmod
+              ? `<url><loc>${escapeXml(page.url)}</loc><lastmod>${page.lastmod}</lastmod></url>\n`
+              : `<url><loc>${escapeXml(page.url)}</loc></url>\n`);
+          }
+          await sitemap.write('</urlset>\n');
+          await sitemap.end();
+        };
+
+        if (pages.length <= SITEMAP_CHUNK_SIZE) {
+          await writeUrlSet(path.join(distDir, 'sitemap.xml'), pages);
+        } else {
+          const index = new StreamWriter(path.join(distDir, 'sitemap.xml'));
+          await index.write('<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n');
+          for (let i = 0; i * SITEMAP_CHUNK_SIZE < pages.length; i++) {
+            await writeUrlSet(
+              path.join(distDir, `sitemap-${i}.xml`),
+              pages.slice(i * SITEMAP_CHUNK_SIZE, (i + 1) * SITEMAP_CHUNK_SIZE)
+            );
+            await index.write(`<sitemap><loc>${new URL(`${base}/sitemap-${i}.xml`, site).href}</loc></sitemap>\n`);
+          }
+          await index.write('</sitemapindex>\n');
+          await index.end();
+        }
+
+        logger.info(`wrote ${feedSets.length * 2} feeds and a sitemap with ${pages.length} URLs`);
+      },
+    },
+  };
+}
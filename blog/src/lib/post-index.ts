@@ -0,0 +1,88 @@
+import { getCollection, type CollectionEntry } from 'astro:content';
+
+export type Post = CollectionEntry<'blog'>;
+export type Category = Post['data']['category'];
+
+export const categories: Category[] = ['product', 'ai', 'life'];
+
+/** 列表页只需要的字段，避免把整篇文章传给分页 */
+export interface PostSummary {
+  slug: string;
+  title: string;
+  description: string;
+  publishDate: Date;
+  category: Category;
+}
+
+export function summarize(post: Post): PostSummary {
+  const { title, description, publishDate, category } = post.data;
+  return { slug: post.slug, title, description, publishDate, category };
+}
+
+export interface PostIndex {
+  /** 全部文章（含草稿），按发布日期从新到旧 */
+  entries: Post[];
+  /** 已发布的文章，按发布日期从新到旧 */
+  published: Post[];
+  /** 已发布文章按分类分组，组内从新到旧 */
+  byCategory: Record<Category, Post[]>;
+  /** 已发布文章按年份分组，组内从新到旧 */
+  byYear: Map<number, Post[]>;
+  /** 有文章的年份，从新到旧 */
+  years: number[];
+  /** 最新的 n 篇已发布文章，可按分类筛选 */
+  latest(n: number, category?: Category): Post[];
+}
+
+function buildIndex(posts: Post[]): PostIndex {
+  const entries = [...posts].sort(
+    (a, b) => b.data.publishDate.valueOf() - a.data.publishDate.valueOf()
+  );
+
+  const published: Post[] = [];
+  const byCategory = Object.fromEntries(
+    categories.map(category => [category, [] as Post[]])
+  ) as Record<Category, Post[]>;
+  const byYear = new Map<number, Post[]>();
+
+  // 一次遍历完成所有分组，各组天然保持从新到旧的顺序
+  for (const post of entries) {
+    if (post.data.draft) continue;
+
+    published.push(post);
+    byCategory[post.data.category].push(post);
+
+    const year = post.data.publishDate.getUTCFullYear();
+    let yearPosts = byYear.get(year);
+    if (!yearPosts) {
+      yearPosts = [];
+      byYear.set(year, yearPosts);
+    }
+    yearPosts.push(post);
+  }
+
+  return {
+    entries,
+    published,
+    byCategory,
+    byYear,
+    years: [...byYear.keys()],
+    latest(n, category) {
+      return (category ? byCategory[category] : published).slice(0, n);
+    },
+  };
+}
+
+let cached: Promise<PostIndex> | undefined;
+
+/**
+ * 读取 blog 集合并建立索引。
+ * 构建时所有页面共用同一份索引；开发模式下每次重新读取，以便看到最新内容。
+ */
+export function getPostIndex(): Promise<PostIndex> {
+  if (import.meta.env.DEV) {
+    return getCollection('blog').then(buildIndex);
+  }
+  cached ??= getCollection('blog').then(buildIndex);
+  return cached;
+}
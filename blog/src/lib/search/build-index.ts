@@ -0,0 +1,61 @@
+import { getPostIndex, type Post } from '../post-index';
+import { DOC_CHUNK_SIZE, SHARD_COUNT, shardOf, tokenize, type SearchDoc, type SearchShard } from './shared';
+
+/** 标题中的词项按这个倍数计入词频 */
+const TITLE_WEIGHT = 3;
+
+export interface SearchIndex {
+  shards: SearchShard[];
+  docChunks: SearchDoc[][];
+}
+
+// 去掉 MDX 的 import/export、标签和链接地址，只保留可读文字
+function plainText(body: string): string {
+  return body
+    .replace(/^(?:import|export)\s.*$/gm, '')
+    .replace(/<[^<>\n]*>/g, ' ')
+    .replace(/\]\([^()\n]*\)/g, ']');
+}
+
+export function buildSearchIndex(posts: Post[]): SearchIndex {
+  const shards: SearchShard[] = Array.from({ length: SHARD_COUNT }, () => ({
+    n: posts.length,
+    t: {},
+  }));
+  const docChunks: SearchDoc[][] = [];
+
+  posts.forEach((post, id) => {
+    const { title, description, publishDate, category } = post.data;
+
+    const chunk = Math.floor(id / DOC_CHUNK_SIZE);
+    (docChunks[chunk] ??= []).push({
+      s: post.slug,
+      t: title,
+      d: publishDate.toISOString().slice(0, 10),
+      c: category,
+    });
+
+    const frequencies = new Map<string, number>();
+    for (const term of tokenize(title, { index: true })) {
+      frequencies.set(term, (frequencies.get(term) ?? 0) + TITLE_WEIGHT);
+    }
+    for (const term of tokenize(`${description}\n${plainText(post.body)}`, { index: true })) {
+      frequencies.set(term, (frequencies.get(term) ?? 0) + 1);
+    }
+
+    // 文章按编号顺序处理，每个词项的倒排列表天然有序
+    for (const [term, frequency] of frequencies) {
+      (shards[shardOf(term)].t[term] ??= []).push(id, frequency);
+    }
+  });
+
+  return { shards, docChunks };
+}
+
+let cached: Promise<SearchIndex> | undefined;
+
+/** 构建时所有分片文件共用同一份索引，只索引已发布的文章 */
+export function getSearchIndex(): Promise<SearchIndex> {
+  cached ??= getPostIndex().then(({ published }) => buildSearchIndex(published));
+  return cached;
+}
@@ -0,0 +1,120 @@
+import { DOC_CHUNK_SIZE, isCjkUnigram, shardOf, tokenize, type SearchDoc, type SearchShard } from './shared';
+
+export interface SearchResult {
+  slug: string;
+  title: string;
+  publishDate: string;
+  category: string;
+  score: number;
+}
+
+// 最近最少使用缓存，Map 的迭代顺序即插入顺序
+class LruCache<K, V> {
+  private entries = new Map<K, V>();
+
+  constructor(private capacity: number) {}
+
+  get(key: K): V | undefined {
+    const value = this.entries.get(key);
+    if (value !== undefined) {
+      this.entries.delete(key);
+      this.entries.set(key, value);
+    }
+    return value;
+  }
+
+  set(key: K, value: V) {
+    this.entries.delete(key);
+    this.entries.set(key, value);
+    if (this.entries.size > this.capacity) {
+      this.entries.delete(this.entries.keys().next().value as K);
+    }
+  }
+
+  delete(key: K) {
+    this.entries.delete(key);
+  }
+}
+
+// 词项在分片中的倒排列表，返回文章编号 → 词频
+// 单个中日韩字同时匹配以它开头的双字词项，词频相加
+function postingsOf(shard: SearchShard, term: string): Map<number, number> {
+  const matches = new Map<number, number>();
+  const add = (postings: number[]) => {
+    for (let i = 0; i < postings.length; i += 2) {
+      matches.set(postings[i], (matches.get(postings[i]) ?? 0) + postings[i + 1]);
+    }
+  };
+
+  if (shard.t[term]) add(shard.t[term]);
+  if (isCjkUnigram(term)) {
+    for (const [key, postings] of Object.entries(shard.t)) {
+      if (key !== term && key.startsWith(term)) add(postings);
+    }
+  }
+  return matches;
+}
+
+/**
+ * 创建搜索客户端。只下载查询用到的分片和结果所在的文章信息文件，
+ * 已下载的文件保存在内存中的 LRU 缓存里。
+ */
+export function createSearchClient(baseUrl: string, { cacheSize = 16 } = {}) {
+  const cache = new LruCache<string, Promise<unknown>>(cacheSize);
+
+  function load<T>(path: string): Promise<T> {
+    let request = cache.get(path);
+    if (!request) {
+      request = fetch(`${baseUrl}${path}`).then(response => {
+        if (!response.ok) {
+          throw new Error(`Failed to load ${path}: ${response.status}`);
+        }
+        return response.json();
+      });
+      // 失败的请求不缓存，下次重试
+      request.catch(() => cache.delete(path));
+      cache.set(path, request);
+    }
+    return request as Promise<T>;
+  }
+
+  /** 返回包含全部查询词项的文章，按 TF-IDF 得分从高到低 */
+  async function search(query: string, limit = 20): Promise<SearchResult[]> {
+    const terms = [...new Set(tokenize(query))];
+    if (terms.length === 0) return [];
+
+    const shards = await Promise.all(
+      terms.map(term => load<SearchShard>(`shards/${shardOf(term)}.json`))
+    );
+
+    let scores: Map<number, number> | undefined;
+    for (let i = 0; i < terms.length; i++) {
+      const postings = postingsOf(shards[i], terms[i]);
+      if (postings.size === 0) return [];
+
+      const idf = Math.log(1 + shards[i].n / postings.size);
+      const next = new Map<number, number>();
+      for (const [doc, frequency] of postings) {
+        const previous = scores ? scores.get(doc) : 0;
+        if (previous !== undefined) {
+          next.set(doc, previous + frequency * idf);
+        }
+      }
+      scores = next;
+      if (scores.size === 0) return [];
+    }
+
+    const top = [...scores!].sort((a, b) => b[1] - a[1]).slice(0, limit);
+    const chunkIds = [...new Set(top.map(([doc]) => Math.floor(doc / DOC_CHUNK_SIZE)))];
+    const chunks = new Map(await Promise.all(
+      chunkIds.map(async chunk => [chunk, await load<SearchDoc[]>(`docs/${chunk}.json`)] as const)
+    ));
+
+    return top.map(([doc, score]) => {
+      const { s, t, d, c } = chunks.get(Math.floor(doc / DOC_CHUNK_SIZE))![doc % DOC_CHUNK_SIZE];
+      return { slug: s, title: t, publishDate: d, category: c, score };
+    });
+  }
+
+  return { search };
+}
@@ -0,0 +1,69 @@
+// 构建索引和浏览器端查询共用的分词与分片规则，两边必须保持一致
+
+/** 倒排索引按词项首字分成的分片数 */
+export const SHARD_COUNT = 64;
+
+/** 每个文章信息文件包含的文章数 */
+export const DOC_CHUNK_SIZE = 256;
+
+/** 分片文件：n 为文章总数，t 为词项 → [文章编号, 词频, 文章编号, 词频, ...] */
+export interface SearchShard {
+  n: number;
+  t: Record<string, number[]>;
+}
+
+/** 文章信息：s 为 slug，t 为标题，d 为发布日期，c 为分类 */
+export interface SearchDoc {
+  s: string;
+  t: string;
+  d: string;
+  c: string;
+}
+
+const CJK = '\\p{Script=Han}\\p{Script=Hiragana}\\p{Script=Katakana}\\p{Script=Hangul}';
+const TOKEN_RE = new RegExp(`[${CJK}]+|(?:(?![${CJK}])[\\p{L}\\p{N}_])+`, 'gu');
+const CJK_RE = new RegExp(`[${CJK}]`, 'u');
+
+/**
+ * 把文本切成词项：中日韩文字按相邻两字切分（单字成段时保留单字），
+ * 其他文字按单词切分并转为小写，忽略单个字母。
+ *
+ * 建索引时（index 为 true）每段中日韩文字的最后一个字也作为单字词项，
+ * 这样每个字的每次出现都落在以它开头的词项上，查询单字时按前缀展开即可，见 isCjkUnigram。
+ */
+export function tokenize(text: string, { index = false } = {}): string[] {
+  const tokens: string[] = [];
+
+  for (const [run] of text.normalize('NFKC').toLowerCase().matchAll(TOKEN_RE)) {
+    if (CJK_RE.test(run)) {
+      const chars = Array.from(run);
+      for (let i = 0; i < chars.length - 1; i++) {
+        tokens.push(chars[i] + chars[i + 1]);
+      }
+      if (chars.length === 1 || index) {
+        tokens.push(chars[chars.length - 1]);
+      }
+    } else if (run.length > 1 || /\d/.test(run)) {
+      tokens.push(run);
+    }
+  }
+
+  return tokens;
+}
+
+/** 单个中日韩字的查询词项，需要匹配以它开头的所有词项；这些词项和它在同一个分片中 */
+export function isCjkUnigram(term: string): boolean {
+  return CJK_RE.test(term) && Array.from(term).length === 1;
+}
+
+/** 词项所在的分片，只取决于首字，便于按前缀定位 */
+export function shardOf(term: string): number {
+  // FNV-1a
+  let hash = 0x811c9dc5;
+  const first = term.codePointAt(0) ?? 0;
+  for (let shift = 0; shift < 32; shift += 8) {
+    hash ^= (first >>> shift) & 0xff;
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return (hash >>> 0) % SHARD_COUNT;
+}
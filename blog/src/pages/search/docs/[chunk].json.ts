@@ -0,0 +1,16 @@
+import type { APIRoute, GetStaticPaths } from 'astro';
+import { getSearchIndex } from '../../../lib/search/build-index';
+
+export const getStaticPaths = (async () => {
+  const { docChunks } = await getSearchIndex();
+  return docChunks.map((_, chunk) => ({
+    params: { chunk: String(chunk) },
+  }));
+}) satisfies GetStaticPaths;
+
+export const GET: APIRoute = async ({ params }) => {
+  const { docChunks } = await getSearchIndex();
+  return new Response(JSON.stringify(docChunks[Number(params.chunk)]), {
+    headers: { 'Content-Type': 'application/json' },
+  });
+};
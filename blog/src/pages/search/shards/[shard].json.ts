@@ -0,0 +1,16 @@
+import type { APIRoute, GetStaticPaths } from 'astro';
+import { getSearchIndex } from '../../../lib/search/build-index';
+import { SHARD_COUNT } from '../../../lib/search/shared';
+
+export const getStaticPaths = (() => {
+  return Array.from({ length: SHARD_COUNT }, (_, shard) => ({
+    params: { shard: String(shard) },
+  }));
+}) satisfies GetStaticPaths;
+
+export const GET: APIRoute = async ({ params }) => {
+  const { shards } = await getSearchIndex();
+  return new Response(JSON.stringify(shards[Number(params.shard)]), {
+    headers: { 'Content-Type': 'application/json' },
+  });
+};